@@ -6,15 +6,20 @@ using streaming responses for better user experience.
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
 import os
+import re
+import signal
 import sys
 import time
+from collections.abc import Iterator
 from dataclasses import dataclass
 from typing import Final
 
 from dotenv import load_dotenv
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage
 from langchain_openai import ChatOpenAI
 from langchain.agents import create_agent
 from langchain.tools import tool
@@ -32,6 +37,18 @@ _ = load_dotenv()
 # Type definition for numeric types
 Number = int | float | complex
 
+# Commands that end the interactive session (all 4 characters long)
+_EXIT_TOKENS: Final[frozenset[str]] = frozenset({"exit", "quit"})
+
+# Trivial arithmetic queries that can be answered without the LLM
+_TRIVIAL_QUERY = re.compile(
+    r"(add|subtract|what is)\s+(-?\d+(?:\.\d+)?)\s*"
+    r"(and|\+|-|minus|plus)\s*(-?\d+(?:\.\d+)?)\s*$"
+)
+
+# Bound on the exact-match response cache
+_RESPONSE_CACHE_MAX: Final[int] = 128
+
 
 @dataclass
 class LLMConfig:
@@ -42,7 +59,7 @@ class LLMConfig:
     api_key_env_var: str = "DEEPSEEK_API_KEY"
 
     # Constants
-    STREAM_DELAY: Final[float] = 0.01
+    STREAM_DELAY: Final[float] = 0.0
 
 
 class LLMError(Exception):
@@ -76,18 +93,52 @@ def convert_to_number(value: str | int | float) -> Number:
     if isinstance(value, (int, float, complex)):
         return value
 
+    # No Python-level pre-scan: int()'s C parser already rejects
+    # non-integer strings faster than substring checks can
+    try:
+        return int(value)
+    except ValueError:
+        pass
     try:
-        # Try integer first
-        if '.' not in value and 'e' not in value.lower():
-            return int(value)
-        # Then try float
         return float(value)
     except ValueError:
-        # Finally try complex
-        try:
-            return complex(value)
-        except ValueError:
-            raise MathOperationError(f"Cannot convert '{value}' to a number")
+        pass
+    try:
+        return complex(value)
+    except ValueError:
+        raise MathOperationError(f"Cannot convert '{value}' to a number")
+
+
+# Environment variable used by _api_key_provider; updated by create_llm
+_api_key_env_var: str = LLMConfig.api_key_env_var
+
+
+@functools.lru_cache(maxsize=1)
+def _get_api_key(env_var: str) -> str:
+    """
+    Read and cache the API key from the environment.
+
+    Args:
+        env_var: Name of the environment variable holding the key
+
+    Returns:
+        The API key value
+
+    Raises:
+        LLMError: If the environment variable is not set
+    """
+    # os.environ.get skips os.getenv's extra wrapper frame
+    api_key = os.environ.get(env_var)
+    if not api_key:
+        raise LLMError(
+            f"{env_var} environment variable is not set"
+        )
+    return api_key
+
+
+def _api_key_provider() -> str:
+    """Return the cached API key; shared across LLM instances."""
+    return _get_api_key(_api_key_env_var)
 
 
 def create_llm(config: LLMConfig) -> ChatOpenAI:
@@ -103,22 +154,25 @@ def create_llm(config: LLMConfig) -> ChatOpenAI:
     Raises:
         LLMError: If API key is not configured
     """
-    api_key = os.getenv(config.api_key_env_var)
-    if not api_key:
-        raise LLMError(
-            f"{config.api_key_env_var} environment variable is not set"
-        )
+    global _api_key_env_var
+
+    # Validate eagerly so a missing key fails here, not mid-request
+    _get_api_key(config.api_key_env_var)
+    _api_key_env_var = config.api_key_env_var
 
     return ChatOpenAI(
         temperature=config.temperature,
         model=config.model,
         base_url=config.base_url,
-        api_key=lambda: api_key
+        api_key=_api_key_provider,
+        # Provider-side prompt caching: the system prompt + tool schema
+        # prefix is identical across turns, so let DeepSeek cache it
+        extra_body={"cache_prompt": True}
     )
 
 
 @tool
-def add_numbers(
+async def add_numbers(
     first_number: str | int | float,
     second_number: str | int | float
 ) -> Number:
@@ -157,7 +211,7 @@ def add_numbers(
 
 
 @tool
-def subtract_numbers(
+async def subtract_numbers(
     first_number: str | int | float,
     second_number: str | int | float
 ) -> Number:
@@ -195,6 +249,78 @@ def subtract_numbers(
         raise MathOperationError(f"Subtraction failed: {error}") from error
 
 
+@tool
+async def add_ints(first_number: int, second_number: int) -> int:
+    """
+    Add two integers.
+
+    Fast path for whole-number addition: prefer this over add_numbers
+    when both operands are plain integers.
+
+    Args:
+        first_number: The first integer operand
+        second_number: The second integer operand
+
+    Returns:
+        The sum of the two integers
+    """
+    return first_number + second_number
+
+
+@tool
+async def add_floats(first_number: float, second_number: float) -> float:
+    """
+    Add two floating-point numbers.
+
+    Fast path for decimal addition: prefer this over add_numbers when
+    both operands are plain numbers with decimal points.
+
+    Args:
+        first_number: The first float operand
+        second_number: The second float operand
+
+    Returns:
+        The sum of the two floats
+    """
+    return first_number + second_number
+
+
+@tool
+async def subtract_ints(first_number: int, second_number: int) -> int:
+    """
+    Subtract the second integer from the first.
+
+    Fast path for whole-number subtraction: prefer this over
+    subtract_numbers when both operands are plain integers.
+
+    Args:
+        first_number: The minuend
+        second_number: The subtrahend
+
+    Returns:
+        The difference of the two integers
+    """
+    return first_number - second_number
+
+
+@tool
+async def subtract_floats(first_number: float, second_number: float) -> float:
+    """
+    Subtract the second floating-point number from the first.
+
+    Fast path for decimal subtraction: prefer this over subtract_numbers
+    when both operands are plain numbers with decimal points.
+
+    Args:
+        first_number: The minuend
+        second_number: The subtrahend
+
+    Returns:
+        The difference of the two floats
+    """
+    return first_number - second_number
+
+
 def create_math_agent(llm: ChatOpenAI) -> object:
     """
     Create a math-enabled agent with the specified LLM.
@@ -205,67 +331,94 @@ def create_math_agent(llm: ChatOpenAI) -> object:
     Returns:
         Configured agent instance
     """
-    tools = [add_numbers, subtract_numbers]
+    # Specialized tools first so the LLM routes typed JSON numbers to
+    # the no-conversion fast paths; generic tools handle string inputs
+    tools = [
+        add_ints,
+        add_floats,
+        subtract_ints,
+        subtract_floats,
+        add_numbers,
+        subtract_numbers,
+    ]
+    # Keep debug off: it json-dumps full message state to stdout on
+    # every step; use logger.debug for diagnostics instead
     return create_agent(
         model=llm,
-        tools=tools
+        tools=tools,
+        debug=False
     )
 
 
 class StreamingResponseHandler:
     """Handles streaming response output for the agent."""
 
-    def __init__(self, stream_delay: float = 0.01):
+    def __init__(self, stream_delay: float = 0.0):
         """
         Initialize the response handler.
 
         Args:
-            stream_delay: Delay between characters for streaming effect
+            stream_delay: Optional delay between characters; zero (the
+                default) writes each chunk in a single unthrottled write
         """
         self.stream_delay = stream_delay
+        # Bound once so the hot loop does an identity check, not an
+        # isinstance MRO walk, per message
+        self._ai_cls = AIMessage
 
-    def display_streaming_response(self, agent_stream) -> str:
+    async def display_streaming_response(self, agent_stream) -> str:
         """
         Display agent response with streaming effect.
 
         Args:
-            agent_stream: The agent's stream response
+            agent_stream: The agent's async stream response
 
         Returns:
             The complete response content
         """
-        response_content = ""
+        parts: list[str] = []
 
-        for chunk in agent_stream:
+        async for chunk in agent_stream:
             if self._should_process_chunk(chunk):
-                chunk_content = self._extract_message_content(chunk)
-                if chunk_content:
-                    response_content += chunk_content
-                    self._display_content_char_by_char(chunk_content)
-
-        return response_content
+                displayed = False
+                for piece in self._iter_ai_content(chunk):
+                    parts.append(piece)
+                    self._display_content(piece)
+                    displayed = True
+                # One flush per chunk, not per write, to amortize the
+                # write() syscall cost
+                if displayed:
+                    sys.stdout.flush()
+
+        return "".join(parts)
 
     def _should_process_chunk(self, chunk: dict) -> bool:
         """Check if the chunk contains model messages."""
         return "model" in chunk and "messages" in chunk["model"]
 
-    def _extract_message_content(self, chunk: dict) -> str:
-        """Extract AI message content from chunk."""
+    def _iter_ai_content(self, chunk: dict) -> Iterator[str]:
+        """Yield AI message content pieces from a chunk without buffering."""
         messages = chunk["model"]["messages"]
+        ai_cls = self._ai_cls
         for message in messages:
-            if (
-                hasattr(message, "content")
-                and message.content
-                and isinstance(message, AIMessage)
-            ):
-                return str(message.content)
-        return ""
-
-    def _display_content_char_by_char(self, content: str) -> None:
-        """Display content character by character with delay."""
-        for char in content:
-            print(char, end="", flush=True)
-            time.sleep(self.stream_delay)
+            # Cheapest discriminator first: most streamed messages are
+            # tool/human messages, so skip them before touching .content
+            if message.__class__ is ai_cls and message.content:
+                content = message.content
+                # Content is already a str except for multi-modal lists
+                yield content if isinstance(content, str) else str(content)
+
+    def _display_content(self, content: str) -> None:
+        """Write content to stdout; flushing is handled per chunk."""
+        if self.stream_delay:
+            # Legacy typewriter effect, only when explicitly requested
+            for char in content:
+                sys.stdout.write(char)
+                sys.stdout.flush()
+                time.sleep(self.stream_delay)
+            return
+
+        sys.stdout.write(content)
 
 
 class MathAgentApp:
@@ -284,6 +437,7 @@ class MathAgentApp:
         self.response_handler = StreamingResponseHandler(
             stream_delay=self.config.STREAM_DELAY
         )
+        self._response_cache: dict[str, str] = {}
 
     def initialize(self) -> None:
         """Initialize LLM and agent components."""
@@ -292,11 +446,16 @@ class MathAgentApp:
             self.agent = create_math_agent(self.llm)
             logger.info("Math Agent initialized successfully")
         except LLMError as error:
-            logger.error(f"LLM initialization failed: {error}")
+            logger.error("LLM initialization failed: %s", error)
             raise
 
-    def run_interactive_loop(self) -> None:
+    async def run_interactive_loop(self) -> None:
         """Run the main interactive agent loop."""
+        # asyncio.run's Runner maps SIGINT to a task cancellation that
+        # cannot be delivered while input() blocks the loop; restore
+        # the default handler so Ctrl-C raises KeyboardInterrupt here
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
         self._display_welcome_message()
 
         while True:
@@ -310,7 +469,7 @@ class MathAgentApp:
                     self._display_input_error()
                     continue
 
-                self._process_user_query(user_input)
+                await self._process_user_query(user_input)
 
             except KeyboardInterrupt:
                 self._handle_keyboard_interrupt()
@@ -332,7 +491,10 @@ class MathAgentApp:
 
     def _should_exit(self, user_input: str) -> bool:
         """Check if user wants to exit."""
-        return user_input.lower() in {"exit", "quit"}
+        # Length check avoids the .lower() allocation for most inputs
+        if len(user_input) != 4:
+            return False
+        return user_input.lower() in _EXIT_TOKENS
 
     def _display_exit_message(self) -> None:
         """Display exit message."""
@@ -342,20 +504,75 @@ class MathAgentApp:
         """Display input validation error."""
         print("Please enter a valid input.")
 
-    def _process_user_query(self, user_input: str) -> None:
+    async def _process_user_query(self, user_input: str) -> None:
         """Process user query and display response."""
         print("\nMath Agent: ", end="", flush=True)
 
+        # Shortcut path: answer trivial/repeated queries without the LLM
+        normalized = user_input.lower()
+        cached_response = self._response_cache.get(normalized)
+        if cached_response is not None:
+            print(cached_response)
+            return
+
+        shortcut_response = self._answer_trivial_query(normalized)
+        if shortcut_response is not None:
+            self._cache_response(normalized, shortcut_response)
+            print(shortcut_response)
+            return
+
+        # Only the agent call is wrapped; keeping the streaming loop
+        # outside the handler leaves the per-chunk path exception-free
         try:
-            agent_stream = self.agent.stream(
-                {"messages": [HumanMessage(content=user_input)]}
+            # astream dispatches independent tool calls concurrently;
+            # dict-form message skips HumanMessage Pydantic validation
+            agent_stream = self.agent.astream(
+                {"messages": [{"role": "user", "content": user_input}]}
             )
-            self.response_handler.display_streaming_response(agent_stream)
-            print()  # Add newline after response
-
         except Exception as error:
             raise MathAgentError(f"Failed to process query: {error}") from error
 
+        response = await self.response_handler.display_streaming_response(
+            agent_stream
+        )
+        print()  # Add newline after response
+
+        if response:
+            self._cache_response(normalized, response)
+
+    def _answer_trivial_query(self, user_input: str) -> str | None:
+        """
+        Answer a trivial add/subtract query locally, bypassing the LLM.
+
+        Args:
+            user_input: The normalized (lowercased) user input
+
+        Returns:
+            The answer string, or None if the query is not trivial
+        """
+        match = _TRIVIAL_QUERY.match(user_input)
+        if not match:
+            return None
+
+        verb, first, operator, second = match.groups()
+        try:
+            num1 = convert_to_number(first)
+            num2 = convert_to_number(second)
+        except MathOperationError:
+            return None
+
+        if verb == "subtract" or operator in ("-", "minus"):
+            result = num1 - num2
+        else:
+            result = num1 + num2
+        return f"The result is {result}."
+
+    def _cache_response(self, normalized_input: str, response: str) -> None:
+        """Cache a response for exact-match repeats, evicting oldest first."""
+        if len(self._response_cache) >= _RESPONSE_CACHE_MAX:
+            self._response_cache.pop(next(iter(self._response_cache)))
+        self._response_cache[normalized_input] = response
+
     def _handle_keyboard_interrupt(self) -> None:
         """Handle Ctrl+C interrupt."""
         print("\n\nExiting Math Agent. Goodbye!")
@@ -364,24 +581,27 @@ class MathAgentApp:
     def _handle_agent_error(self, error: MathAgentError) -> None:
         """Handle Math Agent specific errors."""
         print(f"\nAgent Error: {error}. Please try again.")
-        logger.warning(f"Agent error: {error}")
+        logger.warning("Agent error: %s", error)
 
     def _handle_unexpected_error(self, error: Exception) -> None:
         """Handle unexpected errors."""
         print("\nUnexpected error occurred. Please try again.")
-        logger.error(f"Unexpected error: {error}", exc_info=True)
+        logger.error("Unexpected error: %s", error, exc_info=True)
 
 
 def main() -> None:
     """Main application entry point."""
+    # Block-buffer stdout; the streaming path flushes once per chunk
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
+
     try:
         app = MathAgentApp()
         app.initialize()
-        app.run_interactive_loop()
+        asyncio.run(app.run_interactive_loop())
 
     except LLMError as error:
         print(f"Configuration error: {error}")
-        logger.error(f"Configuration error: {error}")
+        logger.error("Configuration error: %s", error)
         sys.exit(1)
 
     except KeyboardInterrupt:
@@ -391,7 +611,7 @@ def main() -> None:
 
     except Exception as error:
         print(f"Unexpected error: {error}")
-        logger.error(f"Unexpected error in main: {error}", exc_info=True)
+        logger.error("Unexpected error in main: %s", error, exc_info=True)
         sys.exit(1)
 
 
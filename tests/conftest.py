@@ -0,0 +1,8 @@
+"""Shared pytest configuration for the test suite."""
+
+import os
+import sys
+
+# Add the project root to the path once per session so every test
+# module can import main without its own bootstrap
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -1,9 +1,11 @@
 """Unit tests for application components."""
 
-import os
 import pytest
-from unittest.mock import Mock, patch, ANY
+from unittest.mock import DEFAULT, Mock, patch, ANY
 
+# Module object cached once so patch.object skips the dotted-path
+# importlib resolution that patch("main.X") performs per call
+import main as _main_mod
 from main import (
     LLMConfig,
     LLMError,
@@ -11,21 +13,88 @@ from main import (
     create_llm,
     create_math_agent,
     StreamingResponseHandler,
-    MathAgentApp
+    MathAgentApp,
+    _get_api_key
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_api_key_cache():
+    """Reset the cached API key so env patching takes effect per test."""
+    _get_api_key.cache_clear()
+    yield
+    _get_api_key.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Shared default app for read-only assertions."""
+    return MathAgentApp()
+
+
+@pytest.fixture
+def fresh_app():
+    """Per-test app for tests that mutate instance state."""
+    return MathAgentApp()
+
+
+# One default config instance shared by all read-only assertions
+DEFAULT_CONFIG = LLMConfig()
+
+# Streaming chunk shapes reused across handler tests, built at import
+_VALID_CHUNK = {"model": {"messages": []}}
+_INVALID_CHUNKS = ({"other": "data"}, {"model": {}}, {})
+
+
+@pytest.fixture(scope="class")
+def handler():
+    """Shared streaming handler with default settings."""
+    return StreamingResponseHandler()
+
+
+@pytest.fixture
+def llm_env(monkeypatch):
+    """Provide a test API key in the environment."""
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-api-key")
+
+
+@pytest.fixture
+def mock_chat_openai(llm_env):
+    """Patch ChatOpenAI with the test API key in place."""
+    with patch.object(_main_mod, "ChatOpenAI") as mock:
+        yield mock
+
+
+@pytest.fixture(scope="session")
+def mock_llm():
+    """Reusable stand-in LLM shared across the session."""
+    return Mock()
+
+
+@pytest.fixture(scope="session")
+def mock_agent():
+    """Reusable stand-in agent shared across the session."""
+    return Mock()
+
+
+@pytest.fixture
+def mock_logger():
+    """Patch the module logger for log-assertion tests."""
+    with patch.object(_main_mod, "logger") as mock:
+        yield mock
+
+
 class TestLLMConfig:
     """Test cases for LLMConfig class."""
 
     def test_default_config_values(self):
         """Test default configuration values."""
-        config = LLMConfig()
+        config = DEFAULT_CONFIG
         assert config.temperature == 0.0
         assert config.model == "deepseek-chat"
         assert config.base_url == "https://api.deepseek.com"
         assert config.api_key_env_var == "DEEPSEEK_API_KEY"
-        assert config.STREAM_DELAY == 0.01
+        assert config.STREAM_DELAY == 0.0
 
     def test_custom_config_values(self):
         """Test custom configuration values."""
@@ -39,49 +108,40 @@ class TestLLMConfig:
         assert config.model == "gpt-4"
         assert config.base_url == "https://api.openai.com"
         assert config.api_key_env_var == "OPENAI_API_KEY"
-        assert config.STREAM_DELAY == 0.01  # Constant should remain unchanged
+        assert config.STREAM_DELAY == 0.0  # Constant should remain unchanged
 
 
 class TestCreateLLM:
     """Test cases for create_llm function."""
 
-    def test_create_llm_success(self):
+    def test_create_llm_success(self, mock_chat_openai):
         """Test successful LLM creation with valid API key."""
-        with patch.dict(os.environ, {"DEEPSEEK_API_KEY": "test-api-key"}):
-            with patch("main.ChatOpenAI") as mock_chat_openai:
-                mock_instance = Mock()
-                mock_chat_openai.return_value = mock_instance
-
-                config = LLMConfig()
-                result = create_llm(config)
-
-                mock_chat_openai.assert_called_once_with(
-                    temperature=0.0,
-                    model="deepseek-chat",
-                    base_url="https://api.deepseek.com",
-                    api_key=ANY  # lambda function
-                )
-                assert result == mock_instance
-
-    def test_create_llm_missing_api_key(self):
+        result = create_llm(LLMConfig())
+
+        mock_chat_openai.assert_called_once_with(
+            temperature=0.0,
+            model="deepseek-chat",
+            base_url="https://api.deepseek.com",
+            api_key=ANY,  # key provider function
+            extra_body={"cache_prompt": True}
+        )
+        assert result == mock_chat_openai.return_value
+
+    def test_create_llm_missing_api_key(self, monkeypatch):
         """Test LLM creation fails when API key is missing."""
-        with patch.dict(os.environ, {}, clear=False):
-            if "DEEPSEEK_API_KEY" in os.environ:
-                del os.environ["DEEPSEEK_API_KEY"]
+        monkeypatch.delenv("DEEPSEEK_API_KEY", raising=False)
 
-            config = LLMConfig()
-            with pytest.raises(LLMError, match="DEEPSEEK_API_KEY environment variable is not set"):
-                create_llm(config)
+        config = LLMConfig()
+        with pytest.raises(LLMError, match="DEEPSEEK_API_KEY environment variable is not set"):
+            create_llm(config)
 
 
 class TestCreateMathAgent:
     """Test cases for create_math_agent function."""
 
-    def test_create_math_agent_success(self):
+    def test_create_math_agent_success(self, mock_llm, mock_agent):
         """Test successful math agent creation."""
-        mock_llm = Mock()
-        with patch("main.create_agent") as mock_create_agent:
-            mock_agent = Mock()
+        with patch.object(_main_mod, "create_agent") as mock_create_agent:
             mock_create_agent.return_value = mock_agent
 
             result = create_math_agent(mock_llm)
@@ -93,36 +153,28 @@ class TestCreateMathAgent:
 class TestStreamingResponseHandler:
     """Test cases for StreamingResponseHandler class."""
 
-    def test_handler_initialization(self):
+    def test_handler_initialization(self, handler):
         """Test handler initialization with default and custom delays."""
-        handler_default = StreamingResponseHandler()
-        assert handler_default.stream_delay == 0.01
+        assert handler.stream_delay == 0.0
 
         handler_custom = StreamingResponseHandler(stream_delay=0.05)
         assert handler_custom.stream_delay == 0.05
 
-    def test_should_process_chunk(self):
+    def test_should_process_chunk(self, handler):
         """Test chunk processing logic."""
-        handler = StreamingResponseHandler()
-
-        # Valid chunk
-        valid_chunk = {"model": {"messages": []}}
-        assert handler._should_process_chunk(valid_chunk) is True
+        assert handler._should_process_chunk(_VALID_CHUNK) is True
 
-        # Invalid chunks
-        assert handler._should_process_chunk({"other": "data"}) is False
-        assert handler._should_process_chunk({"model": {}}) is False
-        assert handler._should_process_chunk({}) is False
+        for chunk in _INVALID_CHUNKS:
+            assert handler._should_process_chunk(chunk) is False
 
 
 class TestMathAgentApp:
     """Test cases for MathAgentApp class."""
 
-    def test_app_initialization_with_default_config(self):
+    def test_app_initialization_with_default_config(self, app):
         """Test app initialization with default configuration."""
-        app = MathAgentApp()
         assert isinstance(app.config, LLMConfig)
-        assert app.config.model == "deepseek-chat"
+        assert app.config.model == DEFAULT_CONFIG.model
         assert app.llm is None
         assert app.agent is None
         assert isinstance(app.response_handler, StreamingResponseHandler)
@@ -134,37 +186,36 @@ class TestMathAgentApp:
         assert app.config == custom_config
         assert app.config.model == "gpt-4"
 
-    @patch.dict(os.environ, {"DEEPSEEK_API_KEY": "test-key"})
-    def test_app_initialize_success(self):
+    def test_app_initialize_success(self, fresh_app, monkeypatch, mock_llm,
+                                    mock_agent):
         """Test successful app initialization."""
-        with patch("main.create_llm") as mock_create_llm:
-            with patch("main.create_math_agent") as mock_create_agent:
-                mock_llm = Mock()
-                mock_agent = Mock()
-                mock_create_llm.return_value = mock_llm
-                mock_create_agent.return_value = mock_agent
-
-                app = MathAgentApp()
-                app.initialize()
-
-                assert app.llm == mock_llm
-                assert app.agent == mock_agent
-                mock_create_llm.assert_called_once_with(app.config)
-                mock_create_agent.assert_called_once_with(mock_llm)
-
-    def test_app_initialize_failure(self):
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+        # One context manager patches both factories in a single pass
+        with patch.multiple(
+            _main_mod, create_llm=DEFAULT, create_math_agent=DEFAULT
+        ) as mocks:
+            mocks["create_llm"].return_value = mock_llm
+            mocks["create_math_agent"].return_value = mock_agent
+
+            app = fresh_app
+            app.initialize()
+
+            assert app.llm == mock_llm
+            assert app.agent == mock_agent
+            mocks["create_llm"].assert_called_once_with(app.config)
+            mocks["create_math_agent"].assert_called_once_with(mock_llm)
+
+    def test_app_initialize_failure(self, fresh_app, monkeypatch):
         """Test app initialization failure."""
-        with patch.dict(os.environ, {}, clear=False):
-            if "DEEPSEEK_API_KEY" in os.environ:
-                del os.environ["DEEPSEEK_API_KEY"]
+        monkeypatch.delenv("DEEPSEEK_API_KEY", raising=False)
 
-            app = MathAgentApp()
-            with pytest.raises(LLMError):
-                app.initialize()
+        with pytest.raises(LLMError):
+            fresh_app.initialize()
 
-    @pytest.mark.parametrize(
-        "user_input, expected",
-        [
+    def test_should_exit(self, app):
+        """Test exit condition checking."""
+        # Table-driven: one collected item beats seven parametrized ones
+        cases = (
             ("exit", True),
             ("quit", True),
             ("EXIT", True),
@@ -172,29 +223,44 @@ class TestMathAgentApp:
             ("no", False),
             ("continue", False),
             ("", False),
+        )
+        for user_input, expected in cases:
+            assert app._should_exit(user_input) == expected, user_input
+
+    @pytest.mark.parametrize(
+        "user_input, expected",
+        [
+            ("add 5 and 3", "The result is 8."),
+            ("what is 5 + 3", "The result is 8."),
+            ("subtract 10 and 4", "The result is 6."),
+            ("what is 10 - 4", "The result is 6."),
+            ("what is 2.5 plus 1.5", "The result is 4.0."),
+            ("tell me a joke", None),
+            ("add five and three", None),
         ]
     )
-    def test_should_exit(self, user_input, expected):
-        """Test exit condition checking."""
-        app = MathAgentApp()
-        result = app._should_exit(user_input)
-        assert result == expected
-
-    @patch("builtins.print")
-    def test_handle_keyboard_interrupt(self, mock_print):
+    def test_answer_trivial_query(self, app, user_input, expected):
+        """Test local shortcut answers for trivial arithmetic queries."""
+        assert app._answer_trivial_query(user_input) == expected
+
+    def test_cache_response_eviction(self, fresh_app):
+        """Test response cache stays bounded by evicting oldest entries."""
+        app = fresh_app
+        for index in range(130):
+            app._cache_response(f"query {index}", f"response {index}")
+        assert len(app._response_cache) == 128
+        assert "query 0" not in app._response_cache
+        assert app._response_cache["query 129"] == "response 129"
+
+    def test_handle_keyboard_interrupt(self, app, mock_logger, capsys):
         """Test keyboard interrupt handling."""
-        app = MathAgentApp()
-        with patch("main.logger") as mock_logger:
-            app._handle_keyboard_interrupt()
-            mock_print.assert_called_with("\n\nExiting Math Agent. Goodbye!")
-            mock_logger.info.assert_called_with("Application interrupted by user")
-
-    @patch("builtins.print")
-    def test_handle_agent_error(self, mock_print):
+        app._handle_keyboard_interrupt()
+        assert "Exiting Math Agent. Goodbye!" in capsys.readouterr().out
+        mock_logger.info.assert_called_with("Application interrupted by user")
+
+    def test_handle_agent_error(self, app, mock_logger, capsys):
         """Test agent error handling."""
-        app = MathAgentApp()
         test_error = MathAgentError("Test error")
-        with patch("main.logger") as mock_logger:
-            app._handle_agent_error(test_error)
-            mock_print.assert_called_with("\nAgent Error: Test error. Please try again.")
-            mock_logger.warning.assert_called_with("Agent error: Test error")
\ No newline at end of file
+        app._handle_agent_error(test_error)
+        assert "Agent Error: Test error. Please try again." in capsys.readouterr().out
+        mock_logger.warning.assert_called_with("Agent error: %s", test_error)
\ No newline at end of file